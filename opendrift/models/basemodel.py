@@ -189,6 +189,8 @@ class OpenDriftSimulation(PhysicsMethods, Timeable):
         # Using a fixed seed will generate the same random numbers
         # each run, useful for sensitivity tests
         # Use seed = None to get different random numbers each time
+        # (kept, so that modules may seed their own random generators)
+        self.random_seed = seed
         np.random.seed(seed)
 
         self.steps_calculation = 0  # Increase for each simulation step
@@ -15,6 +15,7 @@
 # Copyright 2015, Magne Simonsen, MET Norway
 
 import numpy as np
+from types import SimpleNamespace
 import logging; logger = logging.getLogger(__name__)
 
 from opendrift.models.oceandrift import OceanDrift, Lagrangian3DArray
@@ -94,11 +95,28 @@ class RadionuclideDrift(OceanDrift):
     required_profiles_z_range = [-20, 0]
 
 
+    # Species which may be included, in the order they are numbered, each toggled
+    # by the config setting radionuclide:species:<name with spaces as underscores>
+    _available_species = [
+        'LMM',
+        'LMMcation',
+        'LMManion',
+        'Colloid',
+        'Humic colloid',
+        'Polymer',
+        'Particle reversible',
+        'Particle slowly reversible',
+        'Particle irreversible',
+        'Sediment reversible',
+        'Sediment slowly reversible',
+        'Sediment irreversible',
+        ]
+
     def specie_num2name(self,num):
         return self.name_species[num]
 
     def specie_name2num(self,name):
-        num = self.name_species.index(name)
+        num = self._specie_num[name]
         return num
 
     def __init__(self, *args, **kwargs):
@@ -106,6 +124,10 @@ class RadionuclideDrift(OceanDrift):
         # Calling general constructor of parent class
         super(RadionuclideDrift, self).__init__(*args, **kwargs)
 
+        # Random number generator for the stochastic processes within the
+        # main loop, seeded in the same way as the global numpy generator
+        self._rng = np.random.default_rng(self.random_seed)
+
         # TODO: descriptions and units must be added in config setting below
         self._add_config({
             'radionuclide:transfer_setup': {'type': 'enum',
@@ -224,6 +246,88 @@ class RadionuclideDrift(OceanDrift):
         logger.info('nspecies: %s' % self.nspecies)
         logger.info('Transfer rates:\n %s' % self.transfer_rates)
 
+        # Store config settings used at every time step, to avoid
+        # repeated lookups within the main loop
+        self._cfg = SimpleNamespace(
+            transfer_setup=self.get_config('radionuclide:transfer_setup'),
+            layer_thick=self.get_config('radionuclide:sediment:layer_thick'),
+            desorption_depth=self.get_config('radionuclide:sediment:desorption_depth'),
+            desorption_depth_uncert=self.get_config('radionuclide:sediment:desorption_depth_uncert'),
+            dia_part=self.get_config('radionuclide:particle_diameter'),
+            dia_diss=self.get_config('radionuclide:dissolved_diameter'),
+            particle_diameter_uncertainty=self.get_config('radionuclide:particle_diameter_uncertainty'),
+            slowly=self.get_config('radionuclide:slowly_fraction'),
+            irreversible=self.get_config('radionuclide:irreversible_fraction'),
+            lmm=self.get_config('radionuclide:species:LMM'),
+            lmmcation=self.get_config('radionuclide:species:LMMcation'),
+            lmmanion=self.get_config('radionuclide:species:LMManion'),
+            colloid=self.get_config('radionuclide:species:Colloid'),
+            humic_colloid=self.get_config('radionuclide:species:Humic_colloid'),
+            polymer=self.get_config('radionuclide:species:Polymer'),
+            particle_reversible=self.get_config('radionuclide:species:Particle_reversible'),
+            sediment_reversible=self.get_config('radionuclide:species:Sediment_reversible'),
+            resuspension_critvel=self.get_config('radionuclide:sediment:resuspension_critvel'),
+            resuspension_depth=self.get_config('radionuclide:sediment:resuspension_depth'),
+            resuspension_depth_uncert=self.get_config('radionuclide:sediment:resuspension_depth_uncert'),
+            vertical_mixing=self.get_config('drift:vertical_mixing'),
+            vertical_advection=self.get_config('drift:vertical_advection'),
+            )
+
+        # Particle species and the sediment species they are transferred to
+        # at the seabed (settling), or from (resuspension)
+        particle_codes = []
+        sediment_codes = []
+        if self._cfg.particle_reversible and self._cfg.sediment_reversible:
+            particle_codes.append(self.num_prev)
+            sediment_codes.append(self.num_srev)
+        if self._cfg.slowly:
+            particle_codes.append(self.num_psrev)
+            sediment_codes.append(self.num_ssrev)
+        if self._cfg.irreversible:
+            particle_codes.append(self.num_pirrev)
+            sediment_codes.append(self.num_sirrev)
+        self._particle_codes = np.array(particle_codes, dtype=np.int32)
+        self._sediment_codes = np.array(sediment_codes, dtype=np.int32)
+
+        # Diameter given to elements transforming into each specie
+        # (NaN: unchanged), and species for which the particle size
+        # uncertainty is added
+        self._specie_diameter = np.full(self.nspecies, np.nan)
+        self._specie_is_particle = np.zeros(self.nspecies, dtype=bool)
+        particle_species = []
+        if self._cfg.particle_reversible:
+            particle_species.append(self.num_prev)
+        if self._cfg.slowly:
+            particle_species.append(self.num_psrev)
+        if self._cfg.irreversible:
+            particle_species.append(self.num_pirrev)
+        dissolved_species = []
+        if self._cfg.lmm:
+            dissolved_species.append(self.num_lmm)
+        if self._cfg.lmmanion:
+            dissolved_species.append(self.num_lmmanion)
+        if self._cfg.lmmcation:
+            dissolved_species.append(self.num_lmmcation)
+        if self._cfg.colloid:
+            dissolved_species.append(self.num_col)
+        if self._cfg.humic_colloid:
+            dissolved_species.append(self.num_humcol)
+        if self._cfg.polymer:
+            dissolved_species.append(self.num_polymer)
+        self._specie_diameter[particle_species] = self._cfg.dia_part
+        self._specie_diameter[dissolved_species] = self._cfg.dia_diss
+        self._specie_is_particle[particle_species] = True
+
+        # Species with at least one non-zero transfer rate (for any salinity interval)
+        self._specie_has_transfer = np.any(
+            self.transfer_rates.reshape(-1, self.nspecies, self.nspecies), axis=(0, 2))
+
+        # Work buffers for the transfer rates and transformation
+        # probabilities of all elements (single precision is sufficient
+        # for the transfer rates, and halves the memory traffic)
+        self._tr1d_buf = np.empty((self.num_elements_total(), self.nspecies), dtype=np.float32)
+        self._p_buf = np.empty((self.num_elements_total(), self.nspecies), dtype=np.float32)
+
 
 
 
@@ -254,31 +358,9 @@ class RadionuclideDrift(OceanDrift):
             logger.error('No valid transfer_setup {}'.format(self.get_config('radionuclide:transfer_setup')))
 
 
-        self.name_species=[]
-        if self.get_config('radionuclide:species:LMM'):
-            self.name_species.append('LMM')
-        if self.get_config('radionuclide:species:LMMcation'):
-            self.name_species.append('LMMcation')
-        if self.get_config('radionuclide:species:LMManion'):
-            self.name_species.append('LMManion')
-        if self.get_config('radionuclide:species:Colloid'):
-            self.name_species.append('Colloid')
-        if self.get_config('radionuclide:species:Humic_colloid'):
-            self.name_species.append('Humic colloid')
-        if self.get_config('radionuclide:species:Polymer'):
-            self.name_species.append('Polymer')
-        if self.get_config('radionuclide:species:Particle_reversible'):
-            self.name_species.append('Particle reversible')
-        if self.get_config('radionuclide:species:Particle_slowly_reversible'):
-            self.name_species.append('Particle slowly reversible')
-        if self.get_config('radionuclide:species:Particle_irreversible'):
-            self.name_species.append('Particle irreversible')
-        if self.get_config('radionuclide:species:Sediment_reversible'):
-            self.name_species.append('Sediment reversible')
-        if self.get_config('radionuclide:species:Sediment_slowly_reversible'):
-            self.name_species.append('Sediment slowly reversible')
-        if self.get_config('radionuclide:species:Sediment_irreversible'):
-            self.name_species.append('Sediment irreversible')
+        self.name_species = [name for name in self._available_species
+                             if self.get_config('radionuclide:species:%s' % name.replace(' ', '_'))]
+        self._specie_num = {name: num for num, name in enumerate(self.name_species)}
 
 
         if self.get_config('radionuclide:species:Sediment_slowly_reversible') and \
@@ -420,7 +502,7 @@ class RadionuclideDrift(OceanDrift):
 #        logger.info( 'transfer setup: %s' % transfer_setup)
 
 
-        self.transfer_rates = np.zeros([self.nspecies,self.nspecies])
+        self.transfer_rates = np.zeros([self.nspecies,self.nspecies], dtype=np.float32)
         self.ntransformations = np.zeros([self.nspecies,self.nspecies])
 
         if transfer_setup == 'Bokna_137Cs':
@@ -528,7 +610,8 @@ class RadionuclideDrift(OceanDrift):
             self.salinity_intervals = [0,1,10,20]
 
             # Resize transfer rates array
-            self.transfer_rates = np.zeros([len(self.salinity_intervals),self.transfer_rates.shape[0],self.transfer_rates.shape[1]])
+            self.transfer_rates = np.zeros([len(self.salinity_intervals),self.transfer_rates.shape[0],self.transfer_rates.shape[1]],
+                                           dtype=np.float32)
 
             # Salinity interval 0-1 psu
             self.transfer_rates[0,self.num_lmmcation, self.num_humcol]    = 1.2e-5
@@ -649,49 +732,64 @@ class RadionuclideDrift(OceanDrift):
         DENSpart = self.elements.density
         dr = DENSw-DENSpart  # density difference
 
-        # water viscosity
-        my_w = 0.001*(1.7915 - 0.0538*T0 + 0.007*(T0**(2.0)) - 0.0023*S0)
+        # water viscosity (temperature polynomial in Horner form)
+        my_w = 0.001*(1.7915 + T0*(0.007*T0 - 0.0538) - 0.0023*S0)
         # ~0.0014 kg m-1 s-1
 
         # terminal velocity for low Reynolds numbers
-        W = (1.0/my_w)*(1.0/18.0)*g*partsize**2 * dr
+        # (scalar factors folded, array temporaries updated in place)
+        W = partsize**2 * dr
+        W *= g/18.0
+        W /= my_w
+        W *= self.elements.moving
 
-        self.elements.terminal_velocity = W * self.elements.moving 
+        self.elements.terminal_velocity = W
 
 
     def update_transfer_rates(self):
         '''Pick out the correct row from transfer_rates for each element. Modify the
         transfer rates according to local environmental conditions '''
 
-        transfer_setup=self.get_config('radionuclide:transfer_setup')
+        # Rows are gathered into the preallocated work buffer
+        tr1d = self._tr1d_buf[:self.num_elements_active()]
+
+        transfer_setup=self._cfg.transfer_setup
         if transfer_setup == 'Bokna_137Cs' or \
          transfer_setup=='custom' or \
          transfer_setup=='137Cs_rev':
-            self.elements.transfer_rates1D = self.transfer_rates[self.elements.specie,:]
+            # mode='wrap' lets numpy write straight into out, without buffering
+            np.take(self.transfer_rates, self.elements.specie, axis=0, out=tr1d,
+                    mode='wrap')
+            self.elements.transfer_rates1D = tr1d
 
-            if self.get_config('radionuclide:species:Sediment_reversible'):
+            # Environmental modifications apply to LMM elements only
+            lmm = np.flatnonzero(self.elements.specie == self.num_lmm)
+
+            if self._cfg.sediment_reversible:
                 # Only LMM radionuclides close to seabed are allowed to interact with sediments
                 # minimum height/maximum depth for each particle
-                Zmin = -1.*self.environment.sea_floor_depth_below_sea_level
-                interaction_thick = self.get_config('radionuclide:sediment:layer_thick')      # thickness of seabed interaction layer (m)
-                dist_to_seabed = self.elements.z - Zmin
-                self.elements.transfer_rates1D[(self.elements.specie == self.num_lmm) &
-                                 (dist_to_seabed > interaction_thick), self.num_srev] = 0.
+                Zmin = -1.*self.environment.sea_floor_depth_below_sea_level[lmm]
+                interaction_thick = self._cfg.layer_thick      # thickness of seabed interaction layer (m)
+                dist_to_seabed = self.elements.z[lmm] - Zmin
+                self.elements.transfer_rates1D[lmm[dist_to_seabed > interaction_thick],
+                                               self.num_srev] = 0.
 
 
-            if self.get_config('radionuclide:species:Particle_reversible'):
+            if self._cfg.particle_reversible:
                 # Modify particle adsorption according to local particle concentration
                 # (LMM -> reversible particles)
-                kktmp = self.elements.specie == self.num_lmm
-                self.elements.transfer_rates1D[kktmp, self.num_prev] = \
-                            self.elements.transfer_rates1D[kktmp, self.num_prev] * \
-                            self.environment.conc3[kktmp] / 1.e-3
-        #                    self.environment.particle_conc[kktmp] / 1.e-3
+                self.elements.transfer_rates1D[lmm, self.num_prev] *= \
+                            self.environment.conc3[lmm] / 1.e-3
+        #                    self.environment.particle_conc[lmm] / 1.e-3
 
         elif transfer_setup=='Sandnesfj_Al':
             sal = self.environment.sea_water_salinity
             sali = np.searchsorted(self.salinity_intervals, sal) - 1
-            self.elements.transfer_rates1D = self.transfer_rates[sali,self.elements.specie,:]
+            # Salinity below the first bound (sali == -1) wraps to the last interval
+            np.take(self.transfer_rates.reshape(-1, self.nspecies),
+                    sali*self.nspecies + self.elements.specie, axis=0, out=tr1d,
+                    mode='wrap')
+            self.elements.transfer_rates1D = tr1d
 
 
 
@@ -701,43 +799,56 @@ class RadionuclideDrift(OceanDrift):
         Update element properties for the transformed elements
         '''
 
-        specie_in  = self.elements.specie.copy()    # for storage of the out speciation
+        # Nothing to do if no element is in a specie with transfer processes
+        if not self._specie_has_transfer[self.elements.specie].any():
+            logger.info('Number of transformations: 0')
+            return
+
+        specie_in  = self.elements.specie           # in speciation, not modified below
         specie_out = self.elements.specie.copy()    # for storage of the out speciation
         deltat = self.time_step.seconds             # length of a time step
-        phaseshift = np.array(self.num_elements_active()*[False])  # Denotes which trajectory that shall be transformed
-
-        p = 1. - np.exp(-self.elements.transfer_rates1D*deltat)  # Probability for transformation
-        psum = np.sum(p,axis=1)
-
-        ran1=np.random.random(self.num_elements_active())
+        num_active = len(specie_in)
+
+        # Probability for transformation, p = 1 - exp(-k*dt),
+        # evaluated in place in the preallocated work buffer
+        p = self._p_buf[:num_active]
+        np.multiply(self.elements.transfer_rates1D, -deltat, out=p)
+        np.expm1(p, out=p)
+        np.negative(p, out=p)
+        # Cumulative probability over the transfer processes,
+        # the last column is the total probability for transformation
+        np.cumsum(p, axis=1, out=p)
+        psum = p[:, -1]
+
+        # Random numbers in double precision, as float32 draws are
+        # multiples of 2**-24, which would bias very small probabilities
+        ran1 = self._rng.random(num_active)
 
         # Transformation where ran1 < total probability for transformation
-        phaseshift[ ran1 < psum ] = True
+        phaseshift = np.flatnonzero(ran1 < psum)  # Denotes which trajectory that shall be transformed
 
-        logger.info('Number of transformations: %s' % sum(phaseshift))
-        if sum(phaseshift) == 0:
+        logger.info('Number of transformations: %s' % phaseshift.size)
+        if phaseshift.size == 0:
             return
 
-        ran4 = np.random.random(sum(phaseshift)) # New random number to decide which specie to end up in
-
-        ttmp=[]  # list for storing the out specie
-        # Loop through each trajectory
-        for ii in range(sum(phaseshift)):
-            # Compare random number to the relative probability for each transfer process
-            ttmp.append(np.searchsorted(np.cumsum(p[phaseshift][ii]/psum[phaseshift][ii]),ran4[ii]))
-        specie_out[phaseshift] = np.array(ttmp)
+        # For the transformed elements ran1 is uniformly distributed in [0, psum),
+        # and is reused to decide which specie to end up in: compare it to the
+        # cumulative probability for each transfer process
+        # (row-wise searchsorted for all transforming elements)
+        specie_out[phaseshift] = np.sum(p[phaseshift] < ran1[phaseshift, np.newaxis],
+                                        axis=1, dtype=np.int32)
 
 
         # Set the new speciation
         self.elements.specie=specie_out
 
-        logger.debug('old species: %s' % specie_in[phaseshift])
-        logger.debug('new species: %s' % specie_out[phaseshift])
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('old species: %s' % specie_in[phaseshift])
+            logger.debug('new species: %s' % specie_out[phaseshift])
 
 
-        for iin in range(self.nspecies):
-            for iout in range(self.nspecies):
-                self.ntransformations[iin,iout]+=sum((specie_in[phaseshift]==iin) & (specie_out[phaseshift]==iout))
+        np.add.at(self.ntransformations,
+                  (specie_in[phaseshift], specie_out[phaseshift]), 1)
 
         logger.debug('Number of transformations total:\n %s' % self.ntransformations )
 
@@ -756,14 +867,14 @@ class RadionuclideDrift(OceanDrift):
 
 
         # Set z to local sea depth
-        if self.get_config('radionuclide:species:LMM'):
-            self.elements.z[(sp_out==self.num_srev) & (sp_in==self.num_lmm)] = \
-                -1.*self.environment.sea_floor_depth_below_sea_level[(sp_out==self.num_srev) & (sp_in==self.num_lmm)]
-            self.elements.moving[(sp_out==self.num_srev) & (sp_in==self.num_lmm)] = 0
-        if self.get_config('radionuclide:species:LMMcation'):
-            self.elements.z[(sp_out==self.num_srev) & (sp_in==self.num_lmmcation)] = \
-                -1.*self.environment.sea_floor_depth_below_sea_level[(sp_out==self.num_srev) & (sp_in==self.num_lmmcation)]
-            self.elements.moving[(sp_out==self.num_srev) & (sp_in==self.num_lmmcation)] = 0
+        if self._cfg.lmm:
+            idx = np.flatnonzero((sp_out==self.num_srev) & (sp_in==self.num_lmm))
+            self.elements.z[idx] = -1.*self.environment.sea_floor_depth_below_sea_level[idx]
+            self.elements.moving[idx] = 0
+        if self._cfg.lmmcation:
+            idx = np.flatnonzero((sp_out==self.num_srev) & (sp_in==self.num_lmmcation))
+            self.elements.z[idx] = -1.*self.environment.sea_floor_depth_below_sea_level[idx]
+            self.elements.moving[idx] = 0
         # avoid setting positive z values
         if np.nansum(self.elements.z>0):
             logger.debug('Number of elements lowered down to sea surface: %s' % np.nansum(self.elements.z>0))
@@ -774,26 +885,26 @@ class RadionuclideDrift(OceanDrift):
     def desorption_from_sediments(self,sp_in=None,sp_out=None):
         '''Update radionuclide properties when desorption from sediments occurs'''
 
-        desorption_depth = self.get_config('radionuclide:sediment:desorption_depth')
-        std = self.get_config('radionuclide:sediment:desorption_depth_uncert')
+        desorption_depth = self._cfg.desorption_depth
+        std = self._cfg.desorption_depth_uncert
 
 
-        if self.get_config('radionuclide:species:LMM'):
-            self.elements.z[(sp_out==self.num_lmm) & (sp_in==self.num_srev)] = \
-                -1.*self.environment.sea_floor_depth_below_sea_level[(sp_out==self.num_lmm) & (sp_in==self.num_srev)] + desorption_depth
-            self.elements.moving[(sp_out==self.num_lmm) & (sp_in==self.num_srev)] = 1
+        if self._cfg.lmm:
+            idx = np.flatnonzero((sp_out==self.num_lmm) & (sp_in==self.num_srev))
+            self.elements.z[idx] = \
+                -1.*self.environment.sea_floor_depth_below_sea_level[idx] + desorption_depth
+            self.elements.moving[idx] = 1
             if std > 0:
                 logger.debug('Adding uncertainty for desorption from sediments: %s m' % std)
-                self.elements.z[(sp_out==self.num_lmm) & (sp_in==self.num_srev)] += np.random.normal(
-                        0, std, sum((sp_out==self.num_lmm) & (sp_in==self.num_srev)))
-        if self.get_config('radionuclide:species:LMMcation'):
-            self.elements.z[(sp_out==self.num_lmmcation) & (sp_in==self.num_srev)] = \
-                -1.*self.environment.sea_floor_depth_below_sea_level[(sp_out==self.num_lmmcation) & (sp_in==self.num_srev)] + desorption_depth
-            self.elements.moving[(sp_out==self.num_lmmcation) & (sp_in==self.num_srev)] = 1
+                self.elements.z[idx] += self._rng.normal(0, std, idx.size)
+        if self._cfg.lmmcation:
+            idx = np.flatnonzero((sp_out==self.num_lmmcation) & (sp_in==self.num_srev))
+            self.elements.z[idx] = \
+                -1.*self.environment.sea_floor_depth_below_sea_level[idx] + desorption_depth
+            self.elements.moving[idx] = 1
             if std > 0:
                 logger.debug('Adding uncertainty for desorption from sediments: %s m' % std)
-                self.elements.z[(sp_out==self.num_lmmcation) & (sp_in==self.num_srev)] += np.random.normal(
-                        0, std, sum((sp_out==self.num_lmmcation) & (sp_in==self.num_srev)))
+                self.elements.z[idx] += self._rng.normal(0, std, idx.size)
         # avoid setting positive z values
         if np.nansum(self.elements.z>0):
             logger.debug('Number of elements lowered down to sea surface: %s' % np.nansum(self.elements.z>0))
@@ -807,49 +918,22 @@ class RadionuclideDrift(OceanDrift):
         '''Update the diameter of the radionuclides when specie is changed'''
 
 
-        dia_part=self.get_config('radionuclide:particle_diameter')
-        dia_diss=self.get_config('radionuclide:dissolved_diameter')
-
+        # Elements which have changed specie, and the diameter of their new specie
+        changed = np.flatnonzero(sp_out != sp_in)
+        diameter = self._specie_diameter[sp_out[changed]]
+        update = ~np.isnan(diameter)
+        changed = changed[update]
+        diameter = diameter[update]
 
-        # Transfer to reversible particles
-        self.elements.diameter[(sp_out==self.num_prev) & (sp_in!=self.num_prev)] = dia_part
-        std = self.get_config('radionuclide:particle_diameter_uncertainty')
+        # Transfer to particles (reversible, slowly reversible, irreversible)
+        # include the uncertainty of the particle diameter
+        std = self._cfg.particle_diameter_uncertainty
         if std > 0:
+            particle = self._specie_is_particle[sp_out[changed]]
             logger.debug('Adding uncertainty for particle diameter: %s m' % std)
-            self.elements.diameter[(sp_out==self.num_prev) & (sp_in!=self.num_prev)] += np.random.normal(
-                    0, std, sum((sp_out==self.num_prev) & (sp_in!=self.num_prev)))
-
-        # Transfer to slowly reversible particles
-        if self.get_config('radionuclide:slowly_fraction'):
-            self.elements.diameter[(sp_out==self.num_psrev) & (sp_in!=self.num_psrev)] = dia_part
-            if std > 0:
-                logger.debug('Adding uncertainty for slowly rev particle diameter: %s m' % std)
-                self.elements.diameter[(sp_out==self.num_psrev) & (sp_in!=self.num_psrev)] += np.random.normal(
-                    0, std, sum((sp_out==self.num_psrev) & (sp_in!=self.num_psrev)))
-
-        # Transfer to irreversible particles
-        if self.get_config('radionuclide:irreversible_fraction'):
-            self.elements.diameter[(sp_out==self.num_pirrev) & (sp_in!=self.num_pirrev)] = dia_part
-            if std > 0:
-                logger.debug('Adding uncertainty for irrev particle diameter: %s m' % std)
-                self.elements.diameter[(sp_out==self.num_pirrev) & (sp_in!=self.num_pirrev)] += np.random.normal(
-                    0, std, sum((sp_out==self.num_pirrev) & (sp_in!=self.num_pirrev)))
-
-        # Transfer to LMM
-        if self.get_config('radionuclide:species:LMM'):
-            self.elements.diameter[(sp_out==self.num_lmm) & (sp_in!=self.num_lmm)] = dia_diss
-        if self.get_config('radionuclide:species:LMManion'):
-            self.elements.diameter[(sp_out==self.num_lmmanion) & (sp_in!=self.num_lmmanion)] = dia_diss
-        if self.get_config('radionuclide:species:LMMcation'):
-            self.elements.diameter[(sp_out==self.num_lmmcation) & (sp_in!=self.num_lmmcation)] = dia_diss
+            diameter[particle] += self._rng.normal(0, std, np.count_nonzero(particle))
 
-        # Transfer to colloids
-        if self.get_config('radionuclide:species:Colloid'):
-            self.elements.diameter[(sp_out==self.num_col) & (sp_in!=self.num_col)] = dia_diss
-        if self.get_config('radionuclide:species:Humic_colloid'):
-            self.elements.diameter[(sp_out==self.num_humcol) & (sp_in!=self.num_humcol)] = dia_diss
-        if self.get_config('radionuclide:species:Polymer'):
-            self.elements.diameter[(sp_out==self.num_polymer) & (sp_in!=self.num_polymer)] = dia_diss
+        self.elements.diameter[changed] = diameter
 
 
 
@@ -857,27 +941,19 @@ class RadionuclideDrift(OceanDrift):
     def bottom_interaction(self,Zmin=None):
         ''' Change speciation of radionuclides that reach bottom due to settling.
         particle specie -> sediment specie '''
-        if not  ((self.get_config('radionuclide:species:Particle_reversible')) &
-                  (self.get_config('radionuclide:species:Sediment_reversible')) or
-                  (self.get_config('radionuclide:slowly_fraction')) or
-                  (self.get_config('radionuclide:irreversible_fraction'))):
+        if not  ((self._cfg.particle_reversible) &
+                  (self._cfg.sediment_reversible) or
+                  (self._cfg.slowly) or
+                  (self._cfg.irreversible)):
             return
 
-        bottom = np.array(np.where(self.elements.z <= Zmin)[0])
-        kktmp = np.array(np.where(self.elements.specie[bottom] == self.num_prev)[0])
-        self.elements.specie[bottom[kktmp]] = self.num_srev
-        self.ntransformations[self.num_prev,self.num_srev]+=len(kktmp)
-        self.elements.moving[bottom[kktmp]] = 0
-        if self.get_config('radionuclide:slowly_fraction'):
-            kktmp = np.array(np.where(self.elements.specie[bottom] == self.num_psrev)[0])
-            self.elements.specie[bottom[kktmp]] = self.num_ssrev
-            self.ntransformations[self.num_psrev,self.num_ssrev]+=len(kktmp)
-            self.elements.moving[bottom[kktmp]] = 0
-        if self.get_config('radionuclide:irreversible_fraction'):
-            kktmp = np.array(np.where(self.elements.specie[bottom] == self.num_pirrev)[0])
-            self.elements.specie[bottom[kktmp]] = self.num_sirrev
-            self.ntransformations[self.num_pirrev,self.num_sirrev]+=len(kktmp)
-            self.elements.moving[bottom[kktmp]] = 0
+        bottom = self.elements.z <= Zmin
+        specie = self.elements.specie
+        for sp_part, sp_sed in zip(self._particle_codes, self._sediment_codes):
+            settled = bottom & (specie == sp_part)
+            specie[settled] = sp_sed
+            self.ntransformations[sp_part,sp_sed]+=np.count_nonzero(settled)
+            self.elements.moving[settled] = 0
 
 
 
@@ -887,15 +963,15 @@ class RadionuclideDrift(OceanDrift):
         Sediment species -> Particle specie
         """
         # Exit function if particles and sediments not are present
-        if not  ((self.get_config('radionuclide:species:Particle_reversible')) &
-                  (self.get_config('radionuclide:species:Sediment_reversible'))):
+        if not  ((self._cfg.particle_reversible) &
+                  (self._cfg.sediment_reversible)):
             return
 
         specie_in = self.elements.specie.copy()
 
-        critvel = self.get_config('radionuclide:sediment:resuspension_critvel')
-        resusp_depth = self.get_config('radionuclide:sediment:resuspension_depth')
-        std = self.get_config('radionuclide:sediment:resuspension_depth_uncert')
+        critvel = self._cfg.resuspension_critvel
+        resusp_depth = self._cfg.resuspension_depth
+        std = self._cfg.resuspension_depth_uncert
 
         Zmin = -1.*self.environment.sea_floor_depth_below_sea_level
         x_vel = self.environment.x_sea_water_velocity
@@ -903,28 +979,27 @@ class RadionuclideDrift(OceanDrift):
         speed = np.sqrt(x_vel*x_vel + y_vel*y_vel)
         bottom = (self.elements.z <= Zmin)
 
-        resusp = ( (bottom) & (speed >= critvel) )
-        logger.info('Number of resuspended particles: {}'.format(np.sum(resusp)))
+        resusp = np.flatnonzero( (bottom) & (speed >= critvel) )
+        logger.info('Number of resuspended particles: {}'.format(resusp.size))
         self.elements.moving[resusp] = 1
 
         self.elements.z[resusp] = Zmin[resusp] + resusp_depth
         if std > 0:
             logger.debug('Adding uncertainty for resuspension from sediments: %s m' % std)
-            self.elements.z[resusp] += np.random.normal(
-                        0, std, sum(resusp))
+            self.elements.z[resusp] += self._rng.normal(
+                        0, std, resusp.size)
         # avoid setting positive z values
         if np.nansum(self.elements.z>0):
             logger.debug('Number of elements lowered down to sea surface: %s' % np.nansum(self.elements.z>0))
         self.elements.z[self.elements.z > 0] = 0
 
-        self.ntransformations[self.num_srev,self.num_prev]+=sum((resusp) & (self.elements.specie==self.num_srev))
-        self.elements.specie[(resusp) & (self.elements.specie==self.num_srev)] = self.num_prev
-        if self.get_config('radionuclide:slowly_fraction'):
-            self.ntransformations[self.num_ssrev,self.num_psrev]+=sum((resusp) & (self.elements.specie==self.num_ssrev))
-            self.elements.specie[(resusp) & (self.elements.specie==self.num_ssrev)] = self.num_psrev
-        if self.get_config('radionuclide:irreversible_fraction'):
-            self.ntransformations[self.num_sirrev,self.num_pirrev]+=sum((resusp) & (self.elements.specie==self.num_sirrev))
-            self.elements.specie[(resusp) & (self.elements.specie==self.num_sirrev)] = self.num_pirrev
+        # Sediment specie -> particle specie, only scanning the species
+        # of the resuspended elements
+        resusp_specie = self.elements.specie[resusp]
+        for sp_sed, sp_part in zip(self._sediment_codes, self._particle_codes):
+            kktmp = resusp[resusp_specie == sp_sed]
+            self.ntransformations[sp_sed, sp_part] += kktmp.size
+            self.elements.specie[kktmp] = sp_part
 
         specie_out = self.elements.specie.copy()
         self.update_radionuclide_diameter(specie_in, specie_out)
@@ -938,7 +1013,8 @@ class RadionuclideDrift(OceanDrift):
         """Update positions and properties of radionuclide particles."""
 
         # Workaround due to conversion of datatype
-        self.elements.specie = self.elements.specie.astype(np.int32)
+        # (no copy is made when specie is already a contiguous int32 array)
+        self.elements.specie = self.elements.specie.astype(np.int32, copy=False)
 
         # Radionuclide speciation
         self.update_transfer_rates()
@@ -946,7 +1022,7 @@ class RadionuclideDrift(OceanDrift):
 
 
         # Turbulent Mixing
-        if self.get_config('drift:vertical_mixing') is True:
+        if self._cfg.vertical_mixing is True:
             self.update_terminal_velocity()
             self.vertical_mixing()
         else:
@@ -956,7 +1032,10 @@ class RadionuclideDrift(OceanDrift):
 
         # Resuspension
         self.resuspension()
-        logger.info('Speciation: {} {}'.format([sum(self.elements.specie==ii) for ii in range(self.nspecies)],self.name_species))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info('Speciation: {} {}'.format(
+                np.bincount(self.elements.specie, minlength=self.nspecies).tolist(),
+                self.name_species))
 
 
 
@@ -965,7 +1044,7 @@ class RadionuclideDrift(OceanDrift):
 
 
         # Vertical advection
-        if self.get_config('drift:vertical_advection') is True:
+        if self._cfg.vertical_advection is True:
             self.vertical_advection()
 
 
@@ -2,6 +2,7 @@ from . import *
 from opendrift.readers import reader_netCDF_CF_generic, reader_ROMS_native
 from opendrift.models.radionuclides import RadionuclideDrift
 from datetime import timedelta, datetime
+from types import SimpleNamespace
 import numpy as np
 
 def test_radio_nuclide(test_data):
@@ -40,3 +41,132 @@ def test_radio_nuclide(test_data):
 
 
     o.run(steps=4, time_step=1800, time_step_output=3600)
+
+
+def prepared_model(specie, config={}, environment={}):
+    """RadionuclideDrift with given element species, prepared for a single
+    time step without readers"""
+    o = RadionuclideDrift(loglevel=50, seed=0)
+    o.set_config('radionuclide:transfer_setup', 'custom')
+    for key, value in config.items():
+        o.set_config(key, value)
+    o.init_species()
+    o.init_transfer_rates()
+
+    specie = np.asarray(specie, dtype=np.int32)
+    n = len(specie)
+    o.elements = o.ElementType(lon=np.zeros(n), lat=np.zeros(n),
+                               z=-100.*np.ones(n), specie=specie,
+                               moving=np.ones(n, dtype=np.int32),
+                               diameter=np.ones(n)*1.e-3)
+    env = {'sea_floor_depth_below_sea_level': np.full(n, 100.),
+           'conc3': np.full(n, 1.e-3),
+           'sea_water_salinity': np.full(n, 34.)}
+    env.update(environment)
+    o.environment = SimpleNamespace(**env)
+    o.time_step = timedelta(seconds=1800)
+    o.prepare_run()
+    return o
+
+
+def test_speciation_statistics():
+    n = 200000
+    o = prepared_model(np.zeros(n))  # All elements LMM
+    lmm, prev, srev = o.num_lmm, o.num_prev, o.num_srev
+    o.transfer_rates[lmm, prev] = 1.e-4
+    o.transfer_rates[lmm, srev] = 3.e-4
+    dt = o.time_step.total_seconds()
+    p = 1. - np.exp(-np.array([1.e-4, 3.e-4])*dt)
+    psum = p.sum()
+
+    o.update_transfer_rates()
+    o.update_speciation()
+
+    counts = np.bincount(o.elements.specie, minlength=o.nspecies)
+    ntransformed = counts[prev] + counts[srev]
+    np.testing.assert_allclose(ntransformed / n, psum, atol=.01)
+    np.testing.assert_allclose(counts[[prev, srev]] / n, p, atol=.01)
+    np.testing.assert_allclose(counts[[prev, srev]] / ntransformed, p / psum, atol=.01)
+    np.testing.assert_array_equal(o.ntransformations[lmm, [prev, srev]],
+                                  counts[[prev, srev]])
+    assert o.ntransformations.sum() == ntransformed
+
+
+def test_transfer_rates_custom():
+    o = prepared_model([0, 0, 0, 1, 2],
+                       environment={'conc3': np.array([1.e-3, 2.e-3, 2.e-3, 2.e-3, 2.e-3])})
+    o.elements.z[1] = -90.  # LMM element away from the seabed interaction layer
+    o.update_transfer_rates()
+
+    expected = o.transfer_rates[o.elements.specie, :].copy()
+    expected[1, o.num_srev] = 0.
+    expected[[1, 2], o.num_prev] *= 2.
+    np.testing.assert_allclose(o.elements.transfer_rates1D, expected)
+
+
+def test_transfer_rates_salinity_intervals():
+    o = prepared_model([0, 1, 2, 3, 4, 5],
+                       config={'radionuclide:transfer_setup': 'Sandnesfj_Al'},
+                       environment={'sea_water_salinity':
+                                    np.array([-.5, .5, 5., 15., 25., 34.])})
+    o.update_transfer_rates()
+
+    sali = np.array([-1, 0, 1, 2, 3, 3])
+    np.testing.assert_allclose(o.elements.transfer_rates1D,
+                               o.transfer_rates[sali, o.elements.specie, :])
+
+
+def diameter_model(sp_in, uncertainty):
+    return prepared_model(sp_in, config={
+        'radionuclide:species:Colloid': True,
+        'radionuclide:species:Particle_slowly_reversible': True,
+        'radionuclide:species:Particle_irreversible': True,
+        'radionuclide:species:Sediment_slowly_reversible': True,
+        'radionuclide:species:Sediment_irreversible': True,
+        'radionuclide:dissolved_diameter': 1.e-8,
+        'radionuclide:particle_diameter': 5.e-6,
+        'radionuclide:particle_diameter_uncertainty': uncertainty})
+
+
+def test_radionuclide_diameter():
+    # Species: 0 LMM, 1 Colloid, 2-4 particles, 5-7 sediments
+    sp_in =  np.array([0, 0, 1, 5, 2, 2, 3, 2, 3, 4, 2, 0], dtype=np.int32)
+    sp_out = np.array([2, 3, 4, 2, 0, 1, 1, 5, 6, 7, 2, 0], dtype=np.int32)
+    o = diameter_model(sp_in, uncertainty=0)
+    assert o.name_species[1] == 'Colloid' and o.name_species[7] == 'Sediment irreversible'
+    o.elements.specie = sp_out
+    o.update_radionuclide_diameter(sp_in, sp_out)
+
+    expected = np.array([5.e-6]*4 + [1.e-8]*3 + [1.e-3]*5)
+    np.testing.assert_allclose(o.elements.diameter, expected, rtol=1.e-6)
+
+
+def test_radionuclide_diameter_uncertainty():
+    n = 100000
+    sp_in = np.zeros(n, dtype=np.int32)
+    sp_out = np.full(n, 2, dtype=np.int32)
+    sp_out[::2] = 5  # Transfer to sediment, diameter unchanged
+    o = diameter_model(sp_in, uncertainty=1.e-7)
+    o.update_radionuclide_diameter(sp_in, sp_out)
+
+    np.testing.assert_array_equal(o.elements.diameter[::2], np.float32(1.e-3))
+    particle = o.elements.diameter[1::2]
+    np.testing.assert_allclose(particle.mean(), 5.e-6, atol=5.e-9)
+    np.testing.assert_allclose(particle.std(), 1.e-7, rtol=.05)
+
+
+def test_speciation_no_transfer():
+    # Sediment irreversible has no transfer rates, so no random numbers are needed
+    n = 1000
+    o = prepared_model(np.full(n, 4), config={
+        'radionuclide:species:Particle_irreversible': True,
+        'radionuclide:species:Sediment_irreversible': True})
+    assert o.name_species[4] == 'Sediment irreversible'
+    assert not o.transfer_rates[4].any()
+    o._rng = None  # Any random draw would fail
+
+    o.update_transfer_rates()
+    o.update_speciation()
+
+    np.testing.assert_array_equal(o.elements.specie, 4)
+    assert not o.ntransformations.any()